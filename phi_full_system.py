@@ -1,7 +1,56 @@
+import ast
+import functools
+import logging
 import re
-from typing import Any, Callable, List, Dict
+import sys
+from typing import Any, Callable, List, Dict, Optional
 from enum import Enum
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError: # numba is optional - without it Matrix uses plain NumPy
+    njit = None
+
+# Line patterns of the Phi-lang syntax (compiled once, reused for every line)
+_RE_DATA = re.compile(r"data\s+(\w+)")
+_RE_AXIOM_HEADER = re.compile(r"axiom\s+(\w+)\s*:\s*(hard|soft)\s*\((.*)\)")
+
+# Positional argument names in axiom predicates: a = 1st argument, b = 2nd, ...
+_ARG_NAMES = "abcdefghijklmnopqrstuvwxyz"
+
+def _arg_names_used(node, bound=frozenset()) -> set:
+    """Argument names (a, b, ...) read by a predicate - names bound inside it
+    (comprehension targets, lambda parameters) are not arguments"""
+    if isinstance(node, ast.Name):
+        is_arg = len(node.id) == 1 and node.id in _ARG_NAMES and isinstance(node.ctx, ast.Load)
+        return {node.id} if is_arg and node.id not in bound else set()
+    if isinstance(node, ast.Lambda):
+        params = {arg.arg for arg in ast.walk(node.args) if isinstance(arg, ast.arg)}
+        defaults = node.args.defaults + [d for d in node.args.kw_defaults if d is not None]
+        used = _arg_names_used(node.body, bound | params)
+        for default in defaults: used |= _arg_names_used(default, bound) # Evaluated outside
+        return used
+    if isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp)):
+        used, inner = set(), bound
+        for k, gen in enumerate(node.generators):
+            # The first iterable is evaluated outside the comprehension
+            used |= _arg_names_used(gen.iter, bound if k == 0 else inner)
+            inner = inner | {n.id for n in ast.walk(gen.target) if isinstance(n, ast.Name)}
+            for cond in gen.ifs: used |= _arg_names_used(cond, inner)
+        results = (node.key, node.value) if isinstance(node, ast.DictComp) else (node.elt,)
+        for result in results: used |= _arg_names_used(result, inner)
+        return used
+    used = set()
+    for child in ast.iter_child_nodes(node): used |= _arg_names_used(child, bound)
+    return used
+
+# Logic of a rule that always holds - the validator skips it instead of calling it
+_ALWAYS_TRUE = object()
+
+_log = logging.getLogger("phi")
+
 # ==========================================
 # PART 1: KERNEL V* - BRAIN
 # ==========================================
@@ -11,13 +60,18 @@ class RuleType(Enum):
     SOFT = "soft"
 
 class Rule:
-    def __init__(self, name: str, kind: RuleType, logic_lambda: Callable):
+    __slots__ = ("name", "kind", "logic", "arity", "arg_types", "active")
+    def __init__(self, name: str, kind: RuleType, logic_lambda: Callable,
+                 arity: Optional[int] = None, arg_types: Optional[tuple] = None):
         self.name = name
         self.kind = kind
         self.logic = logic_lambda
+        self.arity = arity          # None = any number of arguments
+        self.arg_types = arg_types  # None = any argument types
         self.active = True
 
 class PhiContext:
+    __slots__ = ("generators", "rules")
     def __init__(self):
         self.generators = {} 
         self.rules = []
@@ -30,123 +84,193 @@ class PhiContext:
         print(f"[R-Kernel] Rule registered: {rule.name} ({rule.kind.value})")
         self.rules.append(rule)
 
+    def set_verbosity(self, level: int):
+        """Sets how much of the V* audit is reported (level of the 'phi' logger)"""
+        _log.setLevel(level)
+
 class Validator:
     def validate(self, func_name, func, args, ctx):
-        print(f"\n--- [V*] Validation: {func_name} ---")
+        _log.info("\n--- [V*] Validation: %s ---", func_name)
         # 1. Execution
         try:
             result = func(*args)
-            print(f"    Result of the operation: {result}")
+            _log.info("    Result of the operation: %s", result)
         except Exception as e:
-            print(f"    CRITICAL ERROR: {e}")
+            _log.error("    CRITICAL ERROR: %s", e)
             return False
 
         # 2. Checking the Rules
+        nargs = len(args)
         for rule in ctx.rules:
             if not rule.active: 
-                print(f"    (Rule '{rule.name}' is inactive - I skip it)")
+                _log.debug("    (Rule '%s' is inactive - I skip it)", rule.name)
                 continue
+
+            # A tautology or a rule that does not match the data - we skip it (without calling it)
+            if rule.logic is _ALWAYS_TRUE: continue
+            if rule.arity is not None and rule.arity != nargs: continue
+            if rule.arg_types and not all(map(isinstance, args, rule.arg_types)): continue
             
             try:
                 # Note: Here the Parser would normally convert the lambda to Python code.
                 # For simplicity, we use predefined lambdas in the demo.
                 is_ok = rule.logic(*args)
             except Exception:
-                continue # The rule may not match the data type, we skip it
+                continue # Backstop - the rule still failed on this data
 
             if is_ok:
-                print(f"    [OK] Rule '{rule.name}' fulfilled.")
+                _log.debug("    [OK] Rule '%s' fulfilled.", rule.name)
             else:
-                print(f"    [!] CONFLICT with the rule '{rule.name}'")
+                _log.info("    [!] CONFLICT with the rule '%s'", rule.name)
                 if rule.kind == RuleType.HARD:
-                    print("    [STOP] Violation of the HARD rule. I reject.")
+                    _log.info("    [STOP] Violation of the HARD rule. I reject.")
                     return False
                 else:
-                    print(f"    [AUTO-FIX] The rule is SOFT. I'm turning it off for this case.")
+                    _log.info("    [AUTO-FIX] The rule is SOFT. I'm turning it off for this case.")
+                    # The rules checked so far are fulfilled, so we simply move on
                     rule.active = False
-                    # Recursion - we check again with the rule disabled
-                    return self.validate(func_name, func, args, ctx)
         
-        print("--- [V*] STATUS: ACCEPT ---")
+        _log.info("--- [V*] STATUS: ACCEPT ---")
         return True
 
 # ==========================================
 # PART 2: PARSER - TEXT TRANSLATOR
 # ==========================================
 
+def _meaningful(src: str):
+    """Yields the stripped lines of the source, without blank lines and // comments"""
+    for raw in src.splitlines():
+        line = raw.strip()
+        if line and not line.startswith("//"):
+            yield line
+
 class PhiParser:
     """
     A simple parser that reads text in Phil-Lang format and calls the appropriate methods in the Kernel (Context).
     """
     def __init__(self, context: PhiContext):
         self.context = context
+        # Keyword -> handler table: each line is dispatched on its first word
+        self._dispatch = {
+            "data": self._parse_data,
+            "axiom": self._parse_axiom,
+            "def": self._parse_def,
+        }
 
     def parse(self, source_code: str):
-        lines = source_code.split('\n')
         print("\n>>> [PARSER] I'm starting to analyze the source code...")
         
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith("//"): continue
-
-            # 1. Parsing Generators (data Name)
-            if line.startswith("data"):
-                # Pattern: data Name ...
-                match = re.search(r"data\s+(\w+)", line)
-                if match:
-                    name = match.group(1)
-                    # In a real compiler we create the class dynamically here.
-                    # In the demo we map a name to an existing Python class.
-                    py_cls = globals().get(name) 
-                    if py_cls:
-                        self.context.register_generator(name, py_cls)
-                    else:
-                        print(f"    [Parser Warning] No implementation found for: {name}")
-
-            # 2. Parsing Rules (axiom name : type (logic))
-            elif line.startswith("axiom"):
-                # Pattern: axiom name: soft/hard
-                parts = line.split(":")
-                if len(parts) >= 2:
-                    header = parts[0].strip() # "axiom commutativity"
-                    body = parts[1].strip()   # "soft (a*b == b*a)"
-                    
-                    rule_name = header.split()[1]
-                    
-                    rule_type = RuleType.HARD
-                    if "soft" in body: rule_type = RuleType.SOFT
-                    
-                    # In the demo we need to "pin" the Python logic to the name from the text
-                    logic = self._resolve_logic(rule_name)
-                    
-                    new_rule = Rule(rule_name, rule_type, logic)
-                    self.context.register_rule(new_rule)
-
-            # 3. Parsing Transformation (def name ...)
-            elif line.startswith("def"):
-                print(f"    [Parser] Function definition found: {line.split()[1]}")
+        for line in _meaningful(source_code):
+            keyword, *rest = line.split(None, 1) # First word - after a space or a tab
+            handler = self._dispatch.get(keyword)
+            if handler: handler(rest[0] if rest else "", line)
 
         print(">>> [PARSER] Analysis completed. Kernel configured..\n")
 
-    def _resolve_logic(self, name):
-        """A helper method that maps names from a text file to Python lambdas."""
-        if name == "commutativity":
-            return lambda a, b: a * b == b * a
-        if name == "identity":
-            return lambda a: a == a
-        return lambda *args: True
+    # 1. Parsing Generators (data Name)
+    def _parse_data(self, rest, line):
+        # Pattern: data Name ...
+        match = _RE_DATA.match(line)
+        if match:
+            name = match.group(1)
+            # In a real compiler we create the class dynamically here.
+            # In the demo we map a name to an existing Python class.
+            py_cls = globals().get(name) 
+            if py_cls:
+                self.context.register_generator(name, py_cls)
+            else:
+                print(f"    [Parser Warning] No implementation found for: {name}")
+
+    # 2. Parsing Rules (axiom name : type (logic))
+    def _parse_axiom(self, rest, line):
+        # Pattern: axiom name : soft/hard (logic)
+        match = _RE_AXIOM_HEADER.match(line)
+        if match:
+            rule_name = match.group(1)
+            rule_type = RuleType(match.group(2))
+            
+            # The logic of the rule is compiled from its text, e.g. "a * b == b * a"
+            logic, arity = self._compile_predicate(match.group(3).strip())
+            if logic is None:
+                print(f"    [Parser Warning] Invalid predicate, rule ignored: {line}")
+                return
+            
+            new_rule = Rule(rule_name, rule_type, logic, arity, self._arg_types(arity))
+            self.context.register_rule(new_rule)
+        else:
+            print(f"    [Parser Warning] Invalid axiom, rule ignored: {line}")
+
+    # 3. Parsing Transformation (def name ...)
+    def _parse_def(self, rest, line):
+        if rest:
+            print(f"    [Parser] Function definition found: {rest.split()[0]}")
+
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _compile_predicate(body):
+        """A helper method that compiles the predicate text of an axiom into a Python function.
+        Returns (function, arity): a is the 1st argument, b the 2nd, ... (arity = last letter used).
+        A text that is not a valid expression gives (None, None)."""
+        try:
+            tree = ast.parse(body, mode="eval")
+        except SyntaxError:
+            return None, None # Not a valid predicate - the caller reports the axiom
+        used = _arg_names_used(tree)
+        if not used:
+            if isinstance(tree.body, ast.Constant) and tree.body.value:
+                return _ALWAYS_TRUE, None
+            params, arity = "*args", None
+        else:
+            arity = max(_ARG_NAMES.index(n) for n in used) + 1
+            params = ", ".join(_ARG_NAMES[:arity])
+        namespace = {}
+        exec(f"def _axiom({params}): return ({body})", namespace)
+        return namespace["_axiom"], arity
+
+    @classmethod
+    def reset_caches(cls):
+        """Drops the compiled predicates (the same axiom text is compiled only once)"""
+        cls._compile_predicate.cache_clear()
+
+    def _arg_types(self, arity):
+        """Argument types of a rule - known only if exactly one structure is registered."""
+        # Only classes - a name may map to any object (a module, a function, ...)
+        types = [cls for cls in self.context.generators.values() if isinstance(cls, type)]
+        if arity is None or len(types) != 1: return None
+        return (types[0],) * arity
 
 # ==========================================
 # PART 3: MATHEMATICAL IMPLEMENTATION (G)
 # ==========================================
 
+if njit is not None:
+    # No signature: the first call compiles the kernel for the actual dtypes
+    @njit(cache=True, fastmath=True)
+    def _mat2_mul(a, b, out):
+        out[0, 0] = a[0, 0] * b[0, 0] + a[0, 1] * b[1, 0]
+        out[0, 1] = a[0, 0] * b[0, 1] + a[0, 1] * b[1, 1]
+        out[1, 0] = a[1, 0] * b[0, 0] + a[1, 1] * b[1, 0]
+        out[1, 1] = a[1, 0] * b[0, 1] + a[1, 1] * b[1, 1]
+else:
+    _mat2_mul = None
+
+def _kernel_dtype(dtype) -> bool:
+    # Dtypes the compiled kernel handles - object arrays (e.g. ints beyond int64) and float16 use @
+    return dtype.kind in "iuf" and dtype != np.float16
+
 class Matrix:
-    def __init__(self, v): self.v = v
-    def __repr__(self): return f"Mat{self.v}"
+    def __init__(self, v): self.v = np.asarray(v)
+    def __repr__(self): return f"Mat{self.v.tolist()}"
     def __mul__(self, other):
-        # Simple multiplication for demo (non-commutative)
-        return Matrix([[self.v[0][0] * other.v[0][0]]]) # Simplified
-    def __eq__(self, other): return self.v == other.v
+        # Full matrix multiplication (non-commutative)
+        if (_mat2_mul is not None and self.v.shape == other.v.shape == (2, 2)
+                and _kernel_dtype(self.v.dtype) and _kernel_dtype(other.v.dtype)):
+            # 2x2 case: compiled kernel, no BLAS call overhead
+            out = np.empty((2, 2), dtype=np.result_type(self.v, other.v))
+            _mat2_mul(self.v, other.v, out)
+            return Matrix(out)
+        return Matrix(self.v @ other.v)
+    def __eq__(self, other): return np.array_equal(self.v, other.v)
 
 # ==========================================
 # PART 4: MAIN PROGRAM (IDE SIMULATION)
@@ -158,7 +282,7 @@ if __name__ == "__main__":
     // This is the code in Phil-lang
     
     // 1. Generators (Ontology)
-    Data Matrix
+    data Matrix
     
     // 2. Rules (Logic) - Notice the keyword 'soft'
     axiom identity : hard ( a == a )
@@ -170,6 +294,8 @@ if __name__ == "__main__":
 
     # 2. System Initialization
     ctx = PhiContext()     # Empty Core
+    logging.basicConfig(format="%(message)s", stream=sys.stdout)
+    ctx.set_verbosity(logging.DEBUG) # Full audit, including fulfilled rules
     parser = PhiParser(ctx) # Parser connected to the Kernel
 
     # 3. The parser reads the text and feeds it to the kernel.
@@ -187,24 +313,6 @@ if __name__ == "__main__":
     # B = [[0, 1], [0, 0]]
     # A*B = [[0, 1], [0, 0]], but B*A = [[0, 0], [0, 0]]
 
-    # We just need to slightly tweak the Matrix class in the code (Part 3),
-    # because that one was simplified to 1x1.
-    # Below is the full, replaced Matrix class and test:
-
-    # (Paste this in place of the old Matrix class in Part 3)
-    class Matrix:
-        def __init__(self, v): self.v = v
-        def __repr__(self): return f"Mat{self.v}"
-        def __mul__(self, other):
-            # Full 2x2 matrix multiplication
-            val = [[0,0],[0,0]]
-            for i in range(2):
-                for j in range(2):
-                    for k in range(2):
-                        val[i][j] += self.v[i][k] * other.v[k][j]
-            return Matrix(val)
-        def __eq__(self, other): return self.v == other.v
-
     m1 = Matrix([[1, 0], [0, 0]])
     m2 = Matrix([[0, 1], [0, 0]])
     
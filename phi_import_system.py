@@ -1,6 +1,50 @@
+import ast
+import functools
+import logging
 import re
-from typing import Any, Callable, List, Dict
+from typing import Any, Callable, List, Dict, Optional
 from enum import Enum
+from types import MappingProxyType
+from sys import intern, stdout
+
+# Line patterns of the Phi-lang syntax (compiled once, reused for every line)
+_RE_AXIOM_HEADER = re.compile(r"axiom\s+(\w+)\s*:\s*(hard|soft)\s*\((.*)\)")
+_RE_MODULE = re.compile(r"module\s+(\w+)")
+_RE_IMPORT = re.compile(r"import\s+(\w+)")
+
+# Positional argument names in axiom predicates: a = 1st argument, b = 2nd, ...
+_ARG_NAMES = "abcdefghijklmnopqrstuvwxyz"
+
+def _arg_names_used(node, bound=frozenset()) -> set:
+    """Argument names (a, b, ...) read by a predicate - names bound inside it
+    (comprehension targets, lambda parameters) are not arguments"""
+    if isinstance(node, ast.Name):
+        is_arg = len(node.id) == 1 and node.id in _ARG_NAMES and isinstance(node.ctx, ast.Load)
+        return {node.id} if is_arg and node.id not in bound else set()
+    if isinstance(node, ast.Lambda):
+        params = {arg.arg for arg in ast.walk(node.args) if isinstance(arg, ast.arg)}
+        defaults = node.args.defaults + [d for d in node.args.kw_defaults if d is not None]
+        used = _arg_names_used(node.body, bound | params)
+        for default in defaults: used |= _arg_names_used(default, bound) # Evaluated outside
+        return used
+    if isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp)):
+        used, inner = set(), bound
+        for k, gen in enumerate(node.generators):
+            # The first iterable is evaluated outside the comprehension
+            used |= _arg_names_used(gen.iter, bound if k == 0 else inner)
+            inner = inner | {n.id for n in ast.walk(gen.target) if isinstance(n, ast.Name)}
+            for cond in gen.ifs: used |= _arg_names_used(cond, inner)
+        results = (node.key, node.value) if isinstance(node, ast.DictComp) else (node.elt,)
+        for result in results: used |= _arg_names_used(result, inner)
+        return used
+    used = set()
+    for child in ast.iter_child_nodes(node): used |= _arg_names_used(child, bound)
+    return used
+
+# Logic of a rule that always holds - the validator skips it instead of calling it
+_ALWAYS_TRUE = object()
+
+_log = logging.getLogger("phi")
 
 # ==========================================
 # 1. KERNEL STRUCTURES
@@ -11,30 +55,149 @@ class RuleType(Enum):
     SOFT = "soft"
 
 class Rule:
-    def __init__(self, name: str, kind: RuleType, logic: Callable, source_module: str):
+    __slots__ = ("name", "kind", "logic", "source_module", "arity", "arg_types", "expr", "active")
+    def __init__(self, name: str, kind: RuleType, logic: Callable, source_module: str,
+                 arity: Optional[int] = None, arg_types: Optional[tuple] = None,
+                 expr: Optional[str] = None):
         self.name = name
         self.kind = kind
         self.logic = logic
         self.source_module = source_module # Trace of the origin of the rule
+        self.arity = arity          # None = any number of arguments
+        self.arg_types = arg_types  # None = any argument types
+        self.expr = expr            # Predicate text from the source, e.g. "b != 0"
         self.active = True
 
+def _is_expression(text: Optional[str]) -> bool:
+    """True if the text is a single Python expression (safe to inline into generated code)"""
+    if not text: return False
+    try:
+        ast.parse(text, mode="eval")
+    except SyntaxError:
+        return False
+    return True
+
 class Generator:
+    __slots__ = ("name", "py_cls")
     def __init__(self, name: str, py_cls: Any):
         self.name = name
         self.py_cls = py_cls
 
 class Module: 
+    __slots__ = ("name", "generators", "rules", "active_rules", "imports",
+                 "_rule_closure_cache", "_closure_version", "_dispatch_cache", "_dispatch_version")
+    # Bumped on every change of rules/imports in ANY module - a cached rule
+    # closure built under an older version is stale (an import may have changed)
+    _graph_version = 0
+
     def __init__(self, name: str):
         self.name = name
         self.generators: Dict[str, Generator] = {}
         self.rules: List[Rule] = []
+        self.active_rules: List[Rule] = [] # Rules not (yet) disabled by V*
         self.imports: List['Module'] = [] # COMPOSITION (C) - Dependency List
+        self._rule_closure_cache: Optional[tuple] = None
+        self._closure_version = -1
+        # (number of args, arg types) -> generated checker of the rules applicable to them
+        self._dispatch_cache: Dict[tuple, Callable] = {}
+        self._dispatch_version = -1
 
     def add_rule(self, rule: Rule):
+        if isinstance(self.rules, tuple):
+            raise RuntimeError(f"Module '{self.name}' is frozen - no more rules can be added")
         self.rules.append(rule)
+        if rule.active: self.active_rules.append(rule)
+        self._invalidate()
+
+    def _deactivate(self, rule: Rule):
+        """Disables a rule of this module - it drops out of every rule closure"""
+        rule.active = False
+        # Keeps the order of the remaining rules
+        self.active_rules = [r for r in self.active_rules if r is not rule]
+        self._invalidate()
         
     def add_import(self, module):
+        if isinstance(self.imports, tuple):
+            raise RuntimeError(f"Module '{self.name}' is frozen - no more imports can be added")
         self.imports.append(module)
+        self._invalidate()
+
+    def freeze(self):
+        """Makes G, R and C read-only (only the active rules can still change)"""
+        self.generators = MappingProxyType(self.generators)
+        self.rules = tuple(self.rules)
+        self.imports = tuple(self.imports)
+
+    def _invalidate(self):
+        self._rule_closure_cache = None
+        Module._graph_version += 1
+
+    def get_active_rules(self) -> tuple:
+        """Active rules of this module and all of its imports (avoids loops).
+        The closure is built once and reused until the module graph changes."""
+        if self._rule_closure_cache is None or self._closure_version != Module._graph_version:
+            collected_rules = []
+            visited = set()
+            seen_rules = set() # (name, kind, text) of the rules collected - an axiom declared again is checked once
+            stack = [self]
+            while stack:
+                module = stack.pop()
+                if module.name in visited: continue
+                visited.add(module.name)
+                for rule in module.active_rules:
+                    identity = (rule.name, rule.kind, rule.expr)
+                    if not rule.active or identity in seen_rules: continue
+                    seen_rules.add(identity)
+                    collected_rules.append(rule)
+                # Reversed, so that imports are visited in declaration order
+                stack.extend(reversed(module.imports))
+            self._rule_closure_cache = tuple(collected_rules)
+            self._closure_version = Module._graph_version
+        return self._rule_closure_cache
+
+    def compile_check(self, nargs: int, rules: tuple) -> Callable:
+        """Generates one straight-line function checking the given rules on nargs arguments.
+        The function takes the argument list and returns the first violated rule (or None)."""
+        src = [f"def _check_{self.name}(args):"]
+        if 0 < nargs <= len(_ARG_NAMES):
+            src.append(f"    {', '.join(_ARG_NAMES[:nargs])}, = args")
+
+        namespace = {}
+        for k, rule in enumerate(rules):
+            namespace[f"_R{k}"] = rule
+            # The predicate text is inlined; rules without usable text call their logic
+            if rule.arity is not None and _is_expression(rule.expr):
+                test = f"({rule.expr})"
+            else:
+                namespace[f"_L{k}"] = rule.logic
+                test = f"_L{k}(*args)"
+            src.append("    try:")
+            src.append(f"        if not {test}: return _R{k}")
+            src.append("    except Exception: pass # The rule does not fit this data")
+        src.append("    return None")
+
+        exec("\n".join(src), namespace)
+        return namespace[f"_check_{self.name}"]
+
+    def _build_dispatch(self, key: tuple) -> Callable:
+        """Selects the active rules matching the signature (arity + types) and compiles their checker.
+        Rules that always hold are left out."""
+        nargs, types = key
+        applicable = tuple(
+            rule for rule in self.get_active_rules()
+            if rule.logic is not _ALWAYS_TRUE
+            and (rule.arity is None or rule.arity == nargs)
+            and (not rule.arg_types or all(map(issubclass, types, rule.arg_types)))
+        )
+        checker = self._dispatch_cache[key] = self.compile_check(nargs, applicable)
+        return checker
+
+    def get_checker(self, key: tuple) -> Callable:
+        """Checker for arguments with the signature key = (number of args, tuple of their types)"""
+        if self._dispatch_version != Module._graph_version:
+            self._dispatch_cache.clear()
+            self._dispatch_version = Module._graph_version
+        return self._dispatch_cache.get(key) or self._build_dispatch(key)
 
 # ==========================================
 # 2. SYSTEM KERNEL (SYSTEM CONTEXT)
@@ -44,8 +207,12 @@ class PhiSystem:
     def __init__(self):
         self.modules: Dict[str, Module] = {}
         self.current_module: Module = None 
+        # (name, kind, predicate text) -> (compiled logic, arity) - identical axioms share the
+        # compiled predicate, but each declaring module keeps its own Rule (and active flag)
+        self._rule_intern: Dict[tuple, tuple] = {}
 
     def create_module(self, name: str):
+        name = intern(name) # Module names are compared by identity in dict lookups
         # If the module already exists, we return it (so we can edit/extend it)
         if name in self.modules:
             self.current_module = self.modules[name]
@@ -58,130 +225,174 @@ class PhiSystem:
         return mod
 
     def get_module(self, name: str):
-        return self.modules.get(name)
+        return self.modules.get(intern(name))
+
+    def freeze(self):
+        """Called once parsing is done - from now on the modules can no longer be extended"""
+        for mod in self.modules.values():
+            mod.freeze()
+
+    def deactivate(self, rule: Rule):
+        """Disables a rule in the module that declares it"""
+        rule.active = False # Inactive rules are left out of every closure, even if the module is not registered
+        module = self.modules.get(rule.source_module)
+        if module is not None and any(r is rule for r in module.active_rules): module._deactivate(rule)
+        Module._graph_version += 1 # Every cached closure and checker is rebuilt without the rule
+
+    def set_verbosity(self, level: int):
+        """Sets how much of the V* audit is reported (level of the 'phi' logger)"""
+        _log.setLevel(level)
 
 class Validator:
     """RECURSIVE validator - checks its own AND imported rules"""
-    
-    def _collect_rules(self, module: Module, collected_rules: List[Rule], visited: set):
-        """Collects rules from a module and its imports (avoids loops)"""
-        if module.name in visited: return
-        visited.add(module.name)
-        
-        # 1. Add rules for this module
-        for rule in module.rules:
-            collected_rules.append(rule)
-            
-        # 2. Recursion to imports
-        for imp_mod in module.imports:
-            self._collect_rules(imp_mod, collected_rules, visited)
 
     def validate(self, module_name: str, func_name: str, func: Callable, args: List[Any], system: PhiSystem):
         target_module = system.get_module(module_name)
         if not target_module:
-            print(f"ERROR: Module not found {module_name}")
+            _log.error("ERROR: Module not found %s", module_name)
             return False
 
-        print(f"\n--- [V*] Validation in: '{module_name}' (with imports) ---")
-        print(f"    Function: {func_name}")
+        _log.info("\n--- [V*] Validation in: '%s' (with imports) ---", module_name)
+        _log.info("    Function: %s", func_name)
 
         # 1. Wykonanie
         try:
             result = func(*args)
-            print(f"    Result: {result}")
+            _log.info("    Result: %s", result)
         except Exception as e:
-            print(f"    EXECUTION ERROR: {e}")
+            _log.error("    EXECUTION ERROR: %s", e)
             return False
 
-        # 2. Collecting ALL applicable rules (C - Composition)
-        all_rules = []
-        self._collect_rules(target_module, all_rules, set())
+        # 2. Collecting ALL applicable rules (C - Composition) - disabled ones are already left out
+        all_rules = target_module.get_active_rules()
         
-        print(f"    [Audit] I'm checking {len(all_rules)} rules (including imports)...")
+        _log.info("    [Audit] I'm checking %s rules (including imports)...", len(all_rules))
+
+        # 3. Verification - the generated checker of the module returns the first violated rule
+        # Only rules matching the signature of the arguments are in the checker
+        key = (len(args), tuple(map(type, args)))
+        disabled = set() # id() of the rules turned off by this validation
+        while True:
+            rule = target_module.get_checker(key)(args)
+            if rule is None: break
 
-        # 3. Verification
-        for rule in all_rules:
-            if not rule.active: continue
+            _log.info("    [!] CONFLICT with the rule '%s' (Source: %s)", rule.name, rule.source_module)
             
-            try:
-                is_ok = rule.logic(*args)
-            except Exception:
-                continue 
-
-            if is_ok:
-                # Optional: we don't spam OK for every rule, only for important ones
-                pass 
-            else:
-                print(f"    [!] CONFLICT with the rule '{rule.name}' (Source: {rule.source_module})")
-                
-                if rule.kind == RuleType.HARD:
-                    print("    [STOP] Violation of the HARD rule. Rejected.")
+            if rule.kind == RuleType.HARD:
+                _log.info("    [STOP] Violation of the HARD rule. Rejected.")
+                return False
+            elif rule.kind == RuleType.SOFT:
+                if id(rule) in disabled:
+                    # Never loop on a rule that could not be removed from the checker
+                    _log.error("    ERROR: The rule '%s' could not be disabled. Rejected.", rule.name)
                     return False
-                elif rule.kind == RuleType.SOFT:
-                    print(f"    [AI-FIX] SOFT rule. I disable it locally.")
-                    rule.active = False
-                    return self.validate(module_name, func_name, func, args, system)
+                _log.info("    [AI-FIX] SOFT rule. I disable it in its module ('%s').", rule.source_module)
+                # Disabling invalidates the checker - the next one checks the remaining rules
+                system.deactivate(rule)
+                disabled.add(id(rule))
 
-        print(f"--- [V*] STATUS: ACCEPT ---")
+        _log.info("--- [V*] STATUS: ACCEPT ---")
         return True
 
 # ==========================================
 # 3. PARSER (WITH IMPORT SUPPORT)
 # ==========================================
 
+def _meaningful(src: str):
+    """Yields the stripped lines of the source, without blank lines and // comments"""
+    for raw in src.splitlines():
+        line = raw.strip()
+        if line and not line.startswith("//"):
+            yield line
+
 class PhiParser:
     def __init__(self, system: PhiSystem):
         self.system = system
+        # Keyword -> handler table: each line is dispatched on its first word
+        self._dispatch = {
+            "module": self._parse_module,
+            "import": self._parse_import,
+            "data": self._parse_data,
+            "axiom": self._parse_axiom,
+        }
 
     def parse(self, code: str):
-        lines = code.split('\n')
         print("\n>>> [PARSER] Code analysis...")
         
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith("//"): continue
-
-            if line.startswith("module"):
-                match = re.search(r"module\s+(\w+)", line)
-                if match: self.system.create_module(match.group(1))
-            
-            elif line.startswith("import"):
-                # Składnia: import ModuleName
-                match = re.search(r"import\s+(\w+)", line)
-                if match and self.system.current_module:
-                    imp_name = match.group(1)
-                    imp_mod = self.system.get_module(imp_name)
-                    if imp_mod:
-                        self.system.current_module.add_import(imp_mod)
-                        print(f"    + [C] Import modułu '{imp_name}' to '{self.system.current_module.name}'")
-                    else:
-                        print(f"    [!] Import error: Module '{imp_name}' unknown (must be defined beforehand)")
-
-            elif self.system.current_module:
-                self._parse_instruction(line)
-
-    def _parse_instruction(self, line):
-        if line.startswith("data"):
-            # ... (simplified for readability, same as before)
-            pass 
-
-        elif line.startswith("axiom"):
-            # axiom name : type (logic)
-            parts = line.split(":")
-            header = parts[0].strip()
-            body = parts[1].strip()
-            name = header.split()[1]
-            kind = RuleType.SOFT if "soft" in body else RuleType.HARD
-            logic = self._resolve_logic(name)
-            # We save source_module!
-            rule = Rule(name, kind, logic, self.system.current_module.name)
-            self.system.current_module.add_rule(rule)
-            print(f"    + [R] Rule added '{name}'")
-
-    def _resolve_logic(self, name):
-        if name == "nonzero": return lambda a, b: b != 0 # Division rule
-        if name == "positive": return lambda a: a > 0
-        return lambda *args: True
+        for line in _meaningful(code):
+            keyword, *rest = line.split(None, 1) # First word - after a space or a tab
+            handler = self._dispatch.get(keyword)
+            if handler: handler(rest[0] if rest else "", line)
+
+    def _parse_module(self, rest, line):
+        match = _RE_MODULE.match(line)
+        if match: self.system.create_module(match.group(1))
+
+    def _parse_import(self, rest, line):
+        # Składnia: import ModuleName
+        match = _RE_IMPORT.match(line)
+        if match and self.system.current_module:
+            imp_name = match.group(1)
+            imp_mod = self.system.get_module(imp_name)
+            if imp_mod:
+                self.system.current_module.add_import(imp_mod)
+                print(f"    + [C] Import modułu '{imp_name}' to '{self.system.current_module.name}'")
+            else:
+                print(f"    [!] Import error: Module '{imp_name}' unknown (must be defined beforehand)")
+
+    def _parse_data(self, rest, line):
+        # ... (simplified for readability, same as before)
+        pass 
+
+    def _parse_axiom(self, rest, line):
+        # axiom name : type (logic)
+        if not self.system.current_module: return
+        match = _RE_AXIOM_HEADER.match(line)
+        if not match:
+            print(f"    [Parser Warning] Invalid axiom, rule ignored: {line}")
+            return
+        name = match.group(1)
+        kind = RuleType(match.group(2))
+        expr = match.group(3).strip()
+        key = (name, kind, expr)
+        compiled = self.system._rule_intern.get(key)
+        if compiled is None:
+            compiled = self.system._rule_intern[key] = self._compile_predicate(expr)
+        logic, arity = compiled
+        if logic is None:
+            print(f"    [Parser Warning] Invalid predicate, rule ignored: {line}")
+            return
+        # We save source_module!
+        rule = Rule(name, kind, logic, self.system.current_module.name, arity, expr=expr)
+        self.system.current_module.add_rule(rule)
+        print(f"    + [R] Rule added '{name}'")
+
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _compile_predicate(body):
+        # Compiles the predicate text (e.g. "b != 0") into a function.
+        # Returns (logic, arity): a = 1st argument, b = 2nd, ... - arity None means any arguments
+        # A text that is not a valid expression gives (None, None).
+        try:
+            tree = ast.parse(body, mode="eval")
+        except SyntaxError:
+            return None, None # Not a valid predicate - the caller reports the axiom
+        used = _arg_names_used(tree)
+        if not used:
+            if isinstance(tree.body, ast.Constant) and tree.body.value:
+                return _ALWAYS_TRUE, None
+            params, arity = "*args", None
+        else:
+            arity = max(_ARG_NAMES.index(n) for n in used) + 1
+            params = ", ".join(_ARG_NAMES[:arity])
+        namespace = {}
+        exec(f"def _axiom({params}): return ({body})", namespace)
+        return namespace["_axiom"], arity
+
+    @classmethod
+    def reset_caches(cls):
+        """Drops the compiled predicates (the same axiom text is compiled only once)"""
+        cls._compile_predicate.cache_clear()
 
 # ==========================================
 # 4. TEST SCENARIO (Dependency Chain)
@@ -205,8 +416,11 @@ if __name__ == "__main__":
     """
 
     sys = PhiSystem()
+    logging.basicConfig(format="%(message)s", stream=stdout)
+    sys.set_verbosity(logging.DEBUG) # Full audit, including fulfilled rules
     parser = PhiParser(sys)
     parser.parse(source_code)
+    sys.freeze()
     validator = Validator()
 
     # Division function (T)
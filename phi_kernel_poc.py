@@ -1,7 +1,11 @@
 import inspect
+import logging
+import sys
 from enum import Enum
 from typing import Callable, Any, List, Dict
 
+_log = logging.getLogger("phi")
+
 # --- 1. FUNDAMENTAL DEFINITIONS (CORE THEORY) ---
 
 class RuleType(Enum):
@@ -10,10 +14,11 @@ class RuleType(Enum):
 
 class PhiContext:
     """Represents the state of knowledge (Ontology G and Rules R)"""
+    __slots__ = ("generators", "rules", "transformations")
     def __init__(self):
         self.generators: Dict[str, Any] = {}  # G
         self.rules: List['Rule'] = []         # R
-        self.transformations: Dict[str, Callable] = [] # T
+        self.transformations: Dict[str, Callable] = {} # T
 
     def register_generator(self, name, cls):
         print(f"[G] Type registration: {name}")
@@ -23,8 +28,13 @@ class PhiContext:
         print(f"[R] Rule registration: {rule.name} ({rule.kind.value})")
         self.rules.append(rule)
 
+    def set_verbosity(self, level: int):
+        """Sets how much of the V* audit is reported (level of the 'phi' logger)"""
+        _log.setLevel(level)
+
 class Rule:
     """Single logical rule"""
+    __slots__ = ("name", "predicate", "kind", "active")
     def __init__(self, name: str, predicate: Callable, kind: RuleType = RuleType.HARD):
         self.name = name
         self.predicate = predicate
@@ -52,44 +62,41 @@ class Validator:
         self.nn = NeuralProposer()
 
     def validate_transformation(self, func_name: str, func: Callable, test_data: List[Any], context: PhiContext):
-        print(f"\n--- [V*] Transformation Validation: {func_name} ---")
+        _log.info("\n--- [V*] Transformation Validation: %s ---", func_name)
         
         # Faza 1: Test run (Execution)
         try:
             result = func(*test_data)
-            print(f"    Execution: Success. Result = {result}")
+            _log.info("    Execution: Success. Result = %s", result)
         except Exception as e:
-            print(f"    Execution error: {e}")
+            _log.error("    Execution error: %s", e)
             return False
 
         # Faza 2: Rule Check (R-Check)
-        all_passed = True
         for rule in context.rules:
             if not rule.active: continue
             
             is_valid = rule.check(*test_data)
-            print(f"    Checking the rule '{rule.name}': {'OK' if is_valid else 'FAIL'}")
+            _log.debug("    Checking the rule '%s': %s", rule.name, 'OK' if is_valid else 'FAIL')
             
             if not is_valid:
                 # CONFLICT DETECTED!
-                print(f"    [!] CONFLICT: Transformation '{func_name}' breaks the rule '{rule.name}'")
+                _log.info("    [!] CONFLICT: Transformation '%s' breaks the rule '%s'", func_name, rule.name)
                 
                 # Faza 3: Repair Loop (R-G-T Loop)
                 decision = self.nn.propose_fix(rule, context="ComplexStructure")
                 
                 if decision == "RELAX_RULE":
-                    print(f"    [AI Decision] Rule is 'SOFT'. System adapts R to G.")
-                    print(f"    [R] STATUS CHANGE: Disabling the rule '{rule.name}' for this context.")
+                    _log.info("    [AI Decision] Rule is 'SOFT'. System adapts R to G.")
+                    _log.info("    [R] STATUS CHANGE: Disabling the rule '%s' for this context.", rule.name)
+                    # The rules checked so far are fulfilled - we continue with the rest
                     rule.active = False
-                    # Revalidation (recursion or continue)
-                    print(f"    [V*] Revalidation after repair...")
-                    return self.validate_transformation(func_name, func, test_data, context)
                 
                 elif decision == "REJECT_TRANSFORMATION":
-                    print(f"    [AI Decision] Rule is 'HARD'. Transformation rejected.")
+                    _log.info("    [AI Decision] Rule is 'HARD'. Transformation rejected.")
                     return False
 
-        print(f"--- [V*] Status: ACCEPT ---\n")
+        _log.info("--- [V*] Status: ACCEPT ---\n")
         return True
 
 # --- 3. TEST SCENARIO (MATHEMATICS) ---
@@ -119,6 +126,8 @@ class Matrix:
 if __name__ == "__main__":
     # 1. Environment Initialization
     ctx = PhiContext()
+    logging.basicConfig(format="%(message)s", stream=sys.stdout)
+    ctx.set_verbosity(logging.DEBUG) # Full audit, including every rule check
     
     # 2. We define G (Ontology)
     ctx.register_generator("Number", Number)
@@ -1,6 +1,69 @@
+import ast
+import functools
+import hashlib
+import itertools
+import logging
+import os
+import pickle
 import re
-from typing import Any, Callable, List, Dict
+from typing import Any, Callable, List, Dict, Optional
 from enum import Enum
+from types import MappingProxyType
+from sys import intern, stdout
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError: # numba is optional - without it Matrix uses plain NumPy
+    njit = None
+
+# Tokens of the Phi-lang source - one regex, the name of the matching group is the token kind.
+# "//" outside parentheses starts a comment up to the end of the line (see PhiParser.parse_ast).
+_RE_TOKEN = re.compile(r"""
+    (?P<NEWLINE>\n)
+  | (?P<KEYWORD>\b(?:module|data|axiom|hard|soft)\b)
+  | (?P<NAME>[^\W\d]\w*)                              # Unicode letters too (e.g. Łódź)
+  | (?P<NUMBER>\d\w*(?:\.\d+)?)
+  | (?P<OP>//|\*\*|[=!<>]=|\S)                       # "//" inside ( ) is floor division
+""", re.VERBOSE)
+
+# Positional argument names in axiom predicates: a = 1st argument, b = 2nd, ...
+_ARG_NAMES = "abcdefghijklmnopqrstuvwxyz"
+
+def _arg_names_used(node, bound=frozenset()) -> set:
+    """Argument names (a, b, ...) read by a predicate - names bound inside it
+    (comprehension targets, lambda parameters) are not arguments"""
+    if isinstance(node, ast.Name):
+        is_arg = len(node.id) == 1 and node.id in _ARG_NAMES and isinstance(node.ctx, ast.Load)
+        return {node.id} if is_arg and node.id not in bound else set()
+    if isinstance(node, ast.Lambda):
+        params = {arg.arg for arg in ast.walk(node.args) if isinstance(arg, ast.arg)}
+        defaults = node.args.defaults + [d for d in node.args.kw_defaults if d is not None]
+        used = _arg_names_used(node.body, bound | params)
+        for default in defaults: used |= _arg_names_used(default, bound) # Evaluated outside
+        return used
+    if isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp)):
+        used, inner = set(), bound
+        for k, gen in enumerate(node.generators):
+            # The first iterable is evaluated outside the comprehension
+            used |= _arg_names_used(gen.iter, bound if k == 0 else inner)
+            inner = inner | {n.id for n in ast.walk(gen.target) if isinstance(n, ast.Name)}
+            for cond in gen.ifs: used |= _arg_names_used(cond, inner)
+        results = (node.key, node.value) if isinstance(node, ast.DictComp) else (node.elt,)
+        for result in results: used |= _arg_names_used(result, inner)
+        return used
+    used = set()
+    for child in ast.iter_child_nodes(node): used |= _arg_names_used(child, bound)
+    return used
+
+# Logic of a rule that always holds - the validator skips it instead of calling it
+_ALWAYS_TRUE = object()
+
+# Check cost of a rule given only as a function (no predicate text) - checked after the others
+_UNKNOWN_COST = 1 << 16
+
+_log = logging.getLogger("phi")
 
 # ==========================================
 # 1. KERNEL EMBEDDINGS
@@ -10,27 +73,162 @@ class RuleType(Enum):
     HARD = "hard"
     SOFT = "soft"
 
+# Rule kinds as small ints - this is how a Module stores them
+HARD_INT = 0
+SOFT_INT = 1
+_KIND_INT = {RuleType.HARD: HARD_INT, RuleType.SOFT: SOFT_INT}
+_INT_KIND = (RuleType.HARD, RuleType.SOFT)
+
 class Rule:
-    def __init__(self, name: str, kind: RuleType, logic: Callable):
-        self.name = name
-        self.kind = kind
-        self.logic = logic
-        self.active = True
+    """View of a single rule - the rule itself lives in the arrays of its Module"""
+    __slots__ = ("module", "index")
+    def __init__(self, module: 'Module', index: int):
+        self.module = module
+        self.index = index
+
+    @property
+    def name(self) -> str: return self.module.rule_name[self.index]
+    @property
+    def kind(self) -> RuleType: return _INT_KIND[self.module.rule_kind[self.index]]
+    @property
+    def logic(self) -> Callable: return self.module.rule_logic[self.index]
+    @property
+    def arity(self) -> Optional[int]: return self.module.rule_arity[self.index]
+    @property
+    def arg_types(self) -> Optional[tuple]: return self.module.rule_types[self.index]
+    @property
+    def active(self) -> bool: return self.module.rule_active[self.index]
+    @active.setter
+    def active(self, value: bool):
+        if value: self.module._activate(self.index)
+        else: self.module._deactivate(self.index)
 
 class Generator: # Data Type Representation (G)
+    __slots__ = ("name", "py_cls")
     def __init__(self, name: str, py_cls: Any):
         self.name = name
         self.py_cls = py_cls
 
+def _commuted_operands(body: Optional[str]):
+    """For a predicate of the form "x * y == y * x" returns the AST nodes (x, y), otherwise None"""
+    if body is None: return None
+    try:
+        tree = ast.parse(body, mode="eval").body
+    except SyntaxError:
+        return None
+    if not isinstance(tree, ast.Compare) or len(tree.ops) != 1 or not isinstance(tree.ops[0], ast.Eq):
+        return None
+    left, right = tree.left, tree.comparators[0]
+    if not all(isinstance(side, ast.BinOp) and isinstance(side.op, ast.Mult) for side in (left, right)):
+        return None
+    if ast.dump(left.left) != ast.dump(right.right) or ast.dump(left.right) != ast.dump(right.left):
+        return None
+    return left.left, left.right
+
 class Module: # COMPOSITION (C) - Isolated world
-    def __init__(self, name: str):
+    __slots__ = ("name", "id", "generators", "transformations",
+                 "rule_name", "rule_kind", "rule_logic", "rule_arity", "rule_types", "rule_check",
+                 "rule_cost", "rule_commutes", "rule_active", "active_idx")
+    def __init__(self, name: str, id: int = 0):
         self.name = name
+        self.id = id # Index of the module in its PhiSystem
         self.generators: Dict[str, Generator] = {}
-        self.rules: List[Rule] = []
-        self.transformations: Dict[str, Callable] = []
-
-    def add_rule(self, rule: Rule):
-        self.rules.append(rule)
+        self.transformations: Dict[str, Callable] = {}
+        # Rules are stored column by column (one list per field, same index = same rule),
+        # so the validator walks flat lists instead of reading attributes of Rule objects.
+        self.rule_name: List[str] = []
+        self.rule_kind: List[int] = []                 # HARD_INT / SOFT_INT
+        self.rule_logic: List[Callable] = []
+        self.rule_arity: List[Optional[int]] = []      # None = any number of arguments
+        self.rule_types: List[Optional[tuple]] = []    # None = any argument types
+        self.rule_check: List[Callable] = []           # Specialized checker (see _specialize)
+        self.rule_cost: List[int] = []                 # Estimated cost of a check (length of the predicate)
+        self.rule_commutes: List[bool] = []            # The predicate is exactly "a * b == b * a"
+        self.rule_active: List[bool] = []
+        # Indices of the active rules - the only ones the validator visits (rules that always hold
+        # are never listed). HARD rules come first, so a rejection never turns off a SOFT rule,
+        # and within a kind the cheapest checks come first; ties keep the declaration order.
+        # Replaced (never mutated) on a change, so a running validation keeps a stable snapshot.
+        self.active_idx: tuple = ()
+
+    def add_rule(self, name: str, kind: RuleType, logic: Callable,
+                 arity: Optional[int] = None, arg_types: Optional[tuple] = None,
+                 expr: Optional[str] = None) -> Rule:
+        if isinstance(self.rule_name, tuple):
+            raise RuntimeError(f"Module '{self.name}' is frozen - no more rules can be added")
+        self.rule_name.append(name)
+        self.rule_kind.append(_KIND_INT[kind])
+        self.rule_logic.append(logic)
+        self.rule_arity.append(arity)
+        self.rule_types.append(arg_types)
+        operands = _commuted_operands(expr)
+        commutes = (arity == 2 and operands is not None
+                    and {getattr(x, "id", None) for x in operands} == {"a", "b"})
+        self.rule_check.append(self._specialize(logic, arity, arg_types, expr, commutes))
+        self.rule_cost.append(len(expr) if expr is not None else _UNKNOWN_COST)
+        self.rule_commutes.append(commutes)
+        self.rule_active.append(True)
+        index = len(self.rule_name) - 1
+        if logic is not _ALWAYS_TRUE: self.active_idx = self._ordered(self.active_idx + (index,))
+        return Rule(self, index)
+
+    def _ordered(self, indices) -> tuple:
+        return tuple(sorted(indices, key=lambda i: (self.rule_kind[i], self.rule_cost[i], i)))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _specialize(logic: Callable, arity: Optional[int], arg_types: Optional[tuple], expr: Optional[str],
+                    commutes: bool = False) -> Callable:
+        """Generates the checker of one rule of this module: a function of the argument list returning
+        True / False, or None when the rule does not fit the arguments (count, types, or it fails on them).
+        The arity and types are baked in as constants and the predicate text is inlined.
+        Generated once per distinct rule - the same axiom added again reuses the checker."""
+        if logic is _ALWAYS_TRUE: return None
+        namespace = {"_L": logic}
+        src = ["def _check(args):"]
+        if arity is not None:
+            src.append(f"    if len(args) != {arity}: return None")
+            src.append(f"    {', '.join(_ARG_NAMES[:arity])}, = args")
+            if arg_types:
+                namespace.update((f"_T{k}", t) for k, t in enumerate(arg_types))
+                guard = " and ".join(f"isinstance({_ARG_NAMES[k]}, _T{k})" for k in range(arity))
+                src.append(f"    if not ({guard}): return None")
+        test = f"({expr})" if expr is not None and arity is not None else "_L(*args)"
+        if commutes and arg_types and all(issubclass(t, Matrix) for t in arg_types):
+            namespace["_commutes"] = _matrix_commutes
+            test = "_commutes(a, b)" # Both products in one matmul call
+        src.append("    try:")
+        src.append(f"        return True if {test} else False")
+        src.append("    except Exception:")
+        src.append("        return None # Backstop - the rule still failed on this data")
+        exec("\n".join(src), namespace)
+        return namespace["_check"]
+
+    def _deactivate(self, index: int):
+        self.rule_active[index] = False
+        self.active_idx = tuple(i for i in self.active_idx if i != index)
+
+    def _activate(self, index: int):
+        self.rule_active[index] = True
+        self.active_idx = self._ordered(i for i in range(len(self.rule_active))
+                                        if self.rule_active[i] and self.rule_logic[i] is not _ALWAYS_TRUE)
+
+    @property
+    def rules(self) -> List[Rule]:
+        return [Rule(self, i) for i in range(len(self.rule_name))]
+
+    def freeze(self):
+        """Makes G, T and the rule definitions read-only (only the active flags can still change)"""
+        self.generators = MappingProxyType(self.generators)
+        self.transformations = MappingProxyType(self.transformations)
+        self.rule_name = tuple(self.rule_name)
+        self.rule_kind = tuple(self.rule_kind)
+        self.rule_logic = tuple(self.rule_logic)
+        self.rule_arity = tuple(self.rule_arity)
+        self.rule_types = tuple(self.rule_types)
+        self.rule_check = tuple(self.rule_check)
+        self.rule_cost = tuple(self.rule_cost)
+        self.rule_commutes = tuple(self.rule_commutes)
 
 # ==========================================
 # 2. SYSTEM KERNEL (SYSTEM CONTEXT)
@@ -39,155 +237,572 @@ class Module: # COMPOSITION (C) - Isolated world
 class PhiSystem:
     def __init__(self):
         self.modules: Dict[str, Module] = {}
+        self._names: Dict[str, int] = {}     # Module name -> id
+        self._by_id: List[Module] = []        # Module id -> Module
         self.current_module: Module = None # Indicator: Where are we now?
 
     def create_module(self, name: str):
+        name = intern(name) # Module names are compared by identity in dict lookups
         print(f"[System] Creating a new module: '{name}'")
-        mod = Module(name)
+        mod_id = self._names.setdefault(name, len(self._by_id))
+        mod = Module(name, mod_id)
+        if mod_id == len(self._by_id): self._by_id.append(mod)
+        else: self._by_id[mod_id] = mod # A module declared again replaces the old one
         self.modules[name] = mod
         self.current_module = mod # We switch the context to the new module
         return mod
 
-    def get_module(self, name: str):
-        return self.modules.get(name)
+    def module_id(self, name: str) -> Optional[int]:
+        """The id of a module - validating by id skips the name lookup"""
+        return self._names.get(name)
+
+    def get_module(self, key):
+        """Looks a module up by name or by id"""
+        if isinstance(key, int):
+            return self._by_id[key] if 0 <= key < len(self._by_id) else None
+        return self.modules.get(intern(key))
+
+    def freeze(self):
+        """Called once parsing is done - from now on the modules can no longer be extended"""
+        for mod in self.modules.values():
+            mod.freeze()
+
+    def set_verbosity(self, level: int):
+        """Sets how much of the V* audit is reported (level of the 'phi' logger)"""
+        _log.setLevel(level)
+
+_VERDICT_CACHE_SIZE = 4096
 
 class Validator:
     """The validator knows which module the code is running in and only uses local rules"""
-    def validate(self, module_name: str, func_name: str, func: Callable, args: List[Any], system: PhiSystem):
+    def __init__(self):
+        # (module, active rules, function, arguments) -> verdict. The key holds the Module object
+        # itself, so modules of other systems (or a module declared again) never share verdicts.
+        # The active rules are part of the key, so a changed rule set never reuses a verdict.
+        self._verdict_cache: Dict[tuple, bool] = {}
+
+    def validate(self, module_name, func_name: str, func: Callable, args: List[Any], system: PhiSystem):
         
+        # The module is given by name or by id (PhiSystem.module_id)
         target_module = system.get_module(module_name)
         if not target_module:
-            print(f"ERROR: Module not found {module_name}")
+            _log.error("ERROR: Module not found %s", module_name)
             return False
+        module_name = target_module.name
+
+        _log.info("\n--- [V*] Validation in the context of the module: '%s' ---", module_name)
+        _log.info("    Function: %s", func_name)
 
-        print(f"\n--- [V*] Validation in the context of the module: '{module_name}' ---")
-        print(f"    Function: {func_name}")
+        # Only arguments hashed by value are cached - a mutable object hashed by identity
+        # could change between two calls and still hit the old verdict
+        key = verdict = None
+        if all(type(arg) in _HASHED_BY_VALUE for arg in args):
+            key = (target_module, target_module.active_idx, func, tuple(args))
+            try:
+                verdict = self._verdict_cache.get(key)
+            except TypeError:
+                key = None # e.g. a Number holding a list - validated every time
+        if verdict is not None:
+            _log.info("--- [V*] STATUS: %s (%s, cached) ---", "ACCEPT" if verdict else "REJECT", module_name)
+            return verdict
 
         # 1. Execution
         try:
             result = func(*args)
-            print(f"    Result: {result}")
+            _log.info("    Result: %s", result)
         except Exception as e:
-            print(f"    EXECUTION ERROR: {e}")
+            _log.error("    EXECUTION ERROR: %s", e)
             return False
 
         # 2. Checking LOCAL Rules for this module
         # This is the Composition key (C) - we only check what applies HERE.
-        for rule in target_module.rules:
-            if not rule.active: continue
-            
-            try:
-                is_ok = rule.logic(*args)
-            except Exception:
-                continue # The rule does not match the data type.
+        names = target_module.rule_name
+        kinds = target_module.rule_kind
+        checks = target_module.rule_check
+        # Disabled rules are not in active_idx at all
+        for i in target_module.active_idx:
+            is_ok = checks[i](args)
+            if is_ok is None: continue # The rule does not match the data
 
             if is_ok:
-                print(f"    [OK] Rule '{rule.name}' fulfilled.")
+                _log.debug("    [OK] Rule '%s' fulfilled.", names[i])
             else:
-                print(f"    [!] CONFLICT with the rule '{rule.name}' ({rule.kind.value})")
+                _log.info("    [!] CONFLICT with the rule '%s' (%s)", names[i], _INT_KIND[kinds[i]].value)
                 
-                if rule.kind == RuleType.HARD:
-                    print("    [STOP] Violation of the HARD rule. I reject.")
+                if kinds[i] == HARD_INT:
+                    _log.info("    [STOP] Violation of the HARD rule. I reject.")
+                    self._remember(key, False)
                     return False
-                elif rule.kind == RuleType.SOFT:
-                    print(f"    [AI-FIX] The rule is SOFT. In this module ('{module_name}') I turn it off.")
-                    rule.active = False
-                    # Rekursja - sprawdź ponownie
-                    return self.validate(module_name, func_name, func, args, system)
-
-        print(f"--- [V*] STATUS: ACCEPT ({module_name}) ---")
+                else:
+                    _log.info("    [AI-FIX] The rule is SOFT. In this module ('%s') I turn it off.", module_name)
+                    # The rules checked so far are fulfilled, so we simply move on
+                    target_module._deactivate(i)
+
+        _log.info("--- [V*] STATUS: ACCEPT (%s) ---", module_name)
+        if key is not None:
+            # Stored under the rule set after the repairs: the key from before still lists the
+            # SOFT rules turned off here, and if they are turned on again they must be re-checked
+            key = (target_module, target_module.active_idx, func, key[3])
+        self._remember(key, True)
         return True
 
+    def _remember(self, key, verdict: bool):
+        if key is None: return
+        if len(self._verdict_cache) >= _VERDICT_CACHE_SIZE:
+            self._verdict_cache.clear()
+        self._verdict_cache[key] = verdict
+
+    def validate_batch(self, module_name, func_name: str, func: Callable, batch: List[List[Any]],
+                       system: PhiSystem) -> List[bool]:
+        """Validates func on every argument list of the batch and returns one verdict per list.
+        The rules are applied in batch order, so a SOFT rule turned off by one item is no longer
+        checked for the following ones."""
+        target_module = system.get_module(module_name)
+        if not target_module:
+            _log.error("ERROR: Module not found %s", module_name)
+            return [False] * len(batch)
+        module_name = target_module.name
+
+        _log.info("\n--- [V*] Batch validation in the context of the module: '%s' ---", module_name)
+        _log.info("    Function: %s (%s argument lists)", func_name, len(batch))
+
+        names = target_module.rule_name
+        kinds = target_module.rule_kind
+        checks = target_module.rule_check
+        # "a * b == b * a" on pairs of matrices: decided for the whole batch with stacked matmuls
+        precomputed = {}
+        commutes = self._batch_commutes(batch)
+        if commutes is not None:
+            for i in target_module.active_idx:
+                types = target_module.rule_types[i]
+                if target_module.rule_commutes[i] and (not types or all(issubclass(Matrix, t) for t in types)):
+                    precomputed[i] = commutes
+
+        verdicts = []
+        for n, args in enumerate(batch):
+            try:
+                func(*args)
+            except Exception as e:
+                _log.error("    [#%s] EXECUTION ERROR: %s", n, e)
+                verdicts.append(False)
+                continue
+            verdict = True
+            for i in target_module.active_idx:
+                is_ok = precomputed[i][n] if i in precomputed else checks[i](args)
+                if is_ok is None or is_ok: continue
+                _log.info("    [#%s] CONFLICT with the rule '%s' (%s)", n, names[i], _INT_KIND[kinds[i]].value)
+                if kinds[i] == HARD_INT:
+                    _log.info("    [STOP] Violation of the HARD rule. I reject.")
+                    verdict = False
+                    break
+                _log.info("    [AI-FIX] The rule is SOFT. In this module ('%s') I turn it off.", module_name)
+                target_module._deactivate(i)
+            verdicts.append(verdict)
+
+        _log.info("--- [V*] BATCH STATUS: %s accepted, %s rejected (%s) ---",
+                  sum(verdicts), len(verdicts) - sum(verdicts), module_name)
+        return verdicts
+
+    @staticmethod
+    def _batch_commutes(batch):
+        # For a batch of (Matrix, Matrix) pairs of one shape: per item, whether a * b == b * a.
+        # None if the batch does not have that form.
+        if not batch or any(len(args) != 2 or not all(isinstance(m, Matrix) for m in args) for args in batch):
+            return None
+        shape = batch[0][0].v.shape
+        if len(shape) != 2 or shape[0] != shape[1]: return None
+        if any(m.v.shape != shape for args in batch for m in args): return None
+        n = len(batch)
+        A = np.stack([args[0].v for args in batch])
+        B = np.stack([args[1].v for args in batch])
+        # [A; B] @ [B; A] = [AB; BA] - both products of every pair in one matmul call
+        P = np.matmul(_widen(np.concatenate((A, B))), _widen(np.concatenate((B, A))))
+        return np.all(P[:n] == P[n:], axis=(1, 2)).tolist()
+
 # ==========================================
 # 3. PARSER (WITH MODULE SUPPORT)
 # ==========================================
 
+_rule_ids = itertools.count()
+
+# Version of the AST produced by PhiParser.parse_ast - bump it when the grammar or the nodes change
+_AST_FORMAT = 5
+
+def _is_ast(nodes) -> bool:
+    """Checks the shape of a (cached) AST: a list of {"name", "items"} module nodes"""
+    if not isinstance(nodes, list): return False
+    for node in nodes:
+        if not isinstance(node, dict) or set(node) != {"name", "items"}: return False
+        if not isinstance(node["name"], str) or not isinstance(node["items"], list): return False
+        for item in node["items"]:
+            if not isinstance(item, tuple) or not all(isinstance(field, str) for field in item): return False
+            if item[:1] in (("data",), ("invalid",)) and len(item) == 2: continue
+            if item[:1] == ("axiom",) and len(item) == 4 and item[2] in ("hard", "soft"): continue
+            return False
+    return True
+
+def _memo(rule):
+    """Packrat memoization: a grammar rule is evaluated at most once per token position"""
+    rule_id = next(_rule_ids)
+    @functools.wraps(rule)
+    def memoized(self, pos):
+        key = (rule_id, pos)
+        if key not in self._memo:
+            self._memo[key] = rule(self, pos)
+        return self._memo[key]
+    return memoized
+
 class PhiParser:
+    # Packrat parser over the token list. Each grammar rule takes a token position and
+    # returns (node, next position), or None if it does not match there:
+    #   program := module*
+    #   module  := "module" NAME "{" item* "}"
+    #   item    := data | axiom     (an axiom that does not parse gives an "invalid" item)
+    #   data    := "data" NAME
+    #   axiom   := "axiom" NAME ":" ("hard" | "soft") "(" ... ")"
+    # Anything else is skipped token by token, just like unknown lines were.
     def __init__(self, system: PhiSystem):
         self.system = system
-
-    def parse(self, code: str):
-        lines = code.split('\n')
+        self._src = ""
+        self._tokens: List[tuple] = []   # (kind, text)
+        self._spans: List[tuple] = []    # (start, end) of each token in the source
+        self._lines: List[int] = []      # Source line of each token
+        self._memo: Dict[tuple, Optional[tuple]] = {}
+
+    def parse(self, code: str, cache_dir: Optional[str] = None):
+        """Parses the source and builds its modules in the system.
+        With cache_dir, the AST is stored there (keyed by a hash of the source) and loaded
+        instead of parsing the next time the same source is given."""
         print("\n>>> [PARSER] Modular structure analysis...")
-        
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith("//"): continue
-
-            # A. Detecting the beginning of a module: "module Name {"
-            if line.startswith("module"):
-                match = re.search(r"module\s+(\w+)", line)
-                if match:
-                    mod_name = match.group(1)
-                    self.system.create_module(mod_name)
-            
-            # B. End of module detection: "}"
-            elif line == "}":
-                # We exit the module (in a simple parser we do nothing, 
-                # because create_module sets current, and the next module will overwrite it)
-                pass
-
-            # C. Parsing the interior (adding to current_module)
-            elif self.system.current_module:
-                self._parse_instruction(line)
-
-    def _parse_instruction(self, line):
-        # 1. Generators (date)
-        if line.startswith("data"):
-            name = line.split()[1]
-            # Mapping to Python classes (mockup)
-            py_cls = globals().get(name)
-            self.system.current_module.generators[name] = Generator(name, py_cls)
-            print(f"    + [G] Type added '{name}' to the module '{self.system.current_module.name}'")
-
-        # 2. Rules (axiom)
-        elif line.startswith("axiom"):
-            # axiom name : type (logic)
-            parts = line.split(":")
-            header = parts[0].strip()
-            body = parts[1].strip()
-            name = header.split()[1]
-            
-            kind = RuleType.SOFT if "soft" in body else RuleType.HARD
-            logic = self._resolve_logic(name)
-            
-            rule = Rule(name, kind, logic)
-            self.system.current_module.add_rule(rule)
-            print(f"    + [R] Rule added '{name}' to the module '{self.system.current_module.name}'")
-
-    def _resolve_logic(self, name):
-        if name == "commutativity": return lambda a, b: a * b == b * a
-        if name == "identity": return lambda a: a == a
-        return lambda *args: True
+        # The parse result (AST) is a list of module nodes:
+        #   {"name": "Arithmetic", "items": [("data", "Number"), ("axiom", name, "hard", "a * b == b * a")]}
+        cache_path = self._ast_cache_path(code, cache_dir) if cache_dir else None
+        nodes = self._load_ast(cache_path) if cache_path else None
+        if nodes is None:
+            nodes = self.parse_ast(code)
+            if cache_path: self._store_ast(cache_path, nodes)
+        for node in nodes:
+            self._load_module(node)
+
+    @staticmethod
+    def _ast_cache_path(code: str, cache_dir: str) -> str:
+        # The AST format is part of the key - a changed grammar never loads an old AST
+        digest = hashlib.blake2b(f"{_AST_FORMAT}\0{code}".encode(), digest_size=16).hexdigest()
+        return os.path.join(cache_dir, f"phi.{digest}.ast.pkl")
+
+    @staticmethod
+    def _load_ast(path: str):
+        try:
+            with open(path, "rb") as f:
+                nodes = pickle.load(f)
+        except Exception:
+            return None # No (usable) cached AST - the source is parsed
+        return nodes if _is_ast(nodes) else None
+
+    @staticmethod
+    def _store_ast(path: str, nodes):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(nodes, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path) # Readers never see a half-written file
+        except OSError as e:
+            _log.debug("    AST cache not written: %s", e)
+
+    def parse_ast(self, code: str) -> List[dict]:
+        """Parses the source into module nodes without touching the system"""
+        self._src = code
+        self._tokens, self._spans, self._lines = [], [], []
+        line = 0
+        depth = 0           # Open parentheses on the current line
+        comment = False     # The rest of the current line is a comment
+        for m in _RE_TOKEN.finditer(code):
+            kind, text = m.lastgroup, m.group()
+            if kind == "NEWLINE":
+                line += 1
+                depth, comment = 0, False
+                continue
+            if comment: continue
+            if text == "//" and depth == 0:
+                comment = True
+                continue
+            if text == "(": depth += 1
+            elif text == ")" and depth: depth -= 1
+            self._tokens.append((kind, text))
+            self._spans.append(m.span())
+            self._lines.append(line)
+        self._memo = {} # Positions refer to this token list only
+        return self._parse_program()
+
+    def _tok(self, pos):
+        return self._tokens[pos][1] if pos < len(self._tokens) else None
+
+    def _is_name(self, pos):
+        return pos < len(self._tokens) and self._tokens[pos][0] == "NAME"
+
+    def _parse_program(self):
+        modules, pos = [], 0
+        while pos < len(self._tokens):
+            hit = self._module(pos)
+            if hit:
+                node, pos = hit
+                modules.append(node)
+            else:
+                if self._tok(pos) == "module":
+                    print(f"    [Parser Warning] 'module' without a valid name: {self._tok(pos + 1)!r}, module ignored")
+                pos += 1 # Stray token outside a module
+        return modules
+
+    # A. A module: "module Name { ... }"
+    @_memo
+    def _module(self, pos):
+        if self._tok(pos) != "module" or not self._is_name(pos + 1): return None
+        name = self._tok(pos + 1)
+        pos += 2
+        if self._tok(pos) == "{": pos += 1
+        items = []
+        while pos < len(self._tokens) and self._tok(pos) not in ("}", "module"):
+            hit = self._data(pos) or self._axiom(pos)
+            if hit:
+                item, pos = hit
+                items.append(item)
+            elif self._tok(pos) == "axiom":
+                # Reported when the module is loaded. The rest of its line is skipped, so that
+                # a "}" or "module" inside the broken predicate does not end the module.
+                items.append(("invalid", f"axiom {self._tok(pos + 1)}"))
+                line = self._lines[pos]
+                while pos < len(self._tokens) and self._lines[pos] == line: pos += 1
+            else:
+                pos += 1
+        if self._tok(pos) == "}": pos += 1
+        return {"name": name, "items": items}, pos
+
+    # B. The interior of a module
+    # 1. Generators (date)
+    @_memo
+    def _data(self, pos):
+        if self._tok(pos) != "data" or not self._is_name(pos + 1): return None
+        return ("data", self._tok(pos + 1)), pos + 2
+
+    # 2. Rules (axiom)
+    @_memo
+    def _axiom(self, pos):
+        # axiom name : type (logic)
+        tok = self._tok
+        if tok(pos) != "axiom" or not self._is_name(pos + 1) or tok(pos + 2) != ":": return None
+        if tok(pos + 3) not in ("hard", "soft") or tok(pos + 4) != "(": return None
+        hit = self._group(pos + 4)
+        if not hit: return None
+        body, end = hit
+        return ("axiom", tok(pos + 1), tok(pos + 3), body), end
+
+    @_memo
+    def _group(self, pos):
+        # "(" ... ")" with balanced parentheses - the node is the source text between them
+        depth = 0
+        for end in range(pos, len(self._tokens)):
+            tok = self._tokens[end][1]
+            if tok == "(":
+                depth += 1
+            elif tok == ")":
+                depth -= 1
+                if depth == 0:
+                    return self._src[self._spans[pos][1]:self._spans[end][0]].strip(), end + 1
+        return None
+
+    # C. Building the system from the parsed modules
+    def _load_module(self, node):
+        self.system.create_module(node["name"])
+        for item in node["items"]:
+            if item[0] == "data": self._add_data(item[1])
+            elif item[0] == "axiom": self._add_axiom(*item[1:])
+            else: print(f"    [Parser Warning] Invalid {item[1]!r} in the module '{node['name']}', rule ignored")
+
+    def _add_data(self, name):
+        # Mapping to Python classes (mockup)
+        py_cls = globals().get(name)
+        self.system.current_module.generators[name] = Generator(name, py_cls)
+        print(f"    + [G] Type added '{name}' to the module '{self.system.current_module.name}'")
+
+    def _add_axiom(self, name, kind, body):
+        logic, arity = self._compile_predicate(body)
+        if logic is None:
+            print(f"    [Parser Warning] Invalid predicate of the axiom '{name}' "
+                  f"in the module '{self.system.current_module.name}', rule ignored: {body}")
+            return
+        arg_types = self._arg_types(arity)
+        tautology = logic is not _ALWAYS_TRUE and self._is_tautology(body, arg_types)
+        if tautology: logic = _ALWAYS_TRUE # Kept as a rule, but never checked
+        self.system.current_module.add_rule(intern(name), RuleType(kind), logic, arity, arg_types, body)
+        print(f"    + [R] Rule added '{name}' to the module '{self.system.current_module.name}'")
+        if tautology:
+            print(f"      (always holds for {arg_types[0].__name__} - it will not be checked)")
+
+    @staticmethod
+    def _is_tautology(body, arg_types):
+        # "x * y == y * x" holds by definition for data types that declare commutative = True.
+        # Decided on the syntax of the axiom: evaluating it on sample values could also
+        # "prove" rules that merely happen to hold for those values (e.g. "b != 0").
+        if not arg_types or not all(getattr(t, "commutative", False) for t in arg_types): return False
+        return _commuted_operands(body) is not None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _compile_predicate(body):
+        # Compiles the predicate text (e.g. "a * b == b * a") into a function.
+        # Returns (logic, arity): a = 1st argument, b = 2nd, ... - arity None means any arguments
+        # A text that is not a valid expression gives (None, None).
+        try:
+            tree = ast.parse(body, mode="eval")
+        except SyntaxError:
+            return None, None # Not a valid predicate - the caller reports the axiom
+        used = _arg_names_used(tree)
+        if not used:
+            if isinstance(tree.body, ast.Constant) and tree.body.value:
+                return _ALWAYS_TRUE, None
+            params, arity = "*args", None
+        else:
+            arity = max(_ARG_NAMES.index(n) for n in used) + 1
+            params = ", ".join(_ARG_NAMES[:arity])
+        namespace = {}
+        exec(f"def _axiom({params}): return ({body})", namespace)
+        return namespace["_axiom"], arity
+
+    @classmethod
+    def reset_caches(cls):
+        """Drops the compiled predicates and checkers (the same axiom text is compiled only once)"""
+        cls._compile_predicate.cache_clear()
+        Module._specialize.cache_clear()
+
+    def _arg_types(self, arity):
+        # Argument types of a rule - known only if the module declares exactly one data type
+        # Only classes - a name may map to any object (a module, a function, ...)
+        types = [g.py_cls for g in self.system.current_module.generators.values() if isinstance(g.py_cls, type)]
+        if arity is None or len(types) != 1: return None
+        return (types[0],) * arity
 
 # ==========================================
 # 4. DATA IMPLEMENTATIONS (G)
 # ==========================================
 
-class Number: # Commutative
+class Number:
+    __slots__ = ("v",)
+    commutative = True # a * b == b * a for all values - such axioms are never checked
     def __init__(self, v): self.v = v
     def __repr__(self): return f"Num({self.v})"
     def __mul__(self, other): return Number(self.v * other.v)
-    def __eq__(self, other): return self.v == other.v
+    def __eq__(self, other):
+        if not isinstance(other, Number): return NotImplemented
+        return self.v == other.v
+    def __hash__(self): return hash(self.v)
+
+if njit is not None:
+    @njit(cache=True)
+    def _matmul(a, b):
+        # c[i][j] = sum(a[i][k] * b[k][j]) - compiled loop, also for integer matrices
+        out = np.zeros((a.shape[0], b.shape[1]), dtype=a.dtype)
+        for i in range(a.shape[0]):
+            for k in range(a.shape[1]):
+                aik = a[i, k]
+                for j in range(b.shape[1]):
+                    out[i, j] += aik * b[k, j]
+        return out
+
+    # The first call compiles (or loads from the cache) - done here, not in the middle of a validation
+    for _dtype in (np.int64, np.float64):
+        _matmul(np.zeros((2, 2), dtype=_dtype), np.zeros((2, 2), dtype=_dtype))
+else:
+    _matmul = None
+
+def _kernel_dtype(dtype) -> bool:
+    # Dtypes the compiled kernel handles - object arrays (e.g. ints beyond int64) and float16 use @
+    return dtype.kind in "iuf" and dtype != np.float16
+
+def _probe_eq(a, b):
+    # Equality of two integer arrays with the same dtype and shape (equal values <=> equal bytes).
+    # Up to 8 bytes (a 2x2 int8 matrix is 4) both are read as one integer and XOR-ed.
+    if a.nbytes <= 8:
+        return (int.from_bytes(a.tobytes(), "little") ^ int.from_bytes(b.tobytes(), "little")) == 0
+    return a.tobytes() == b.tobytes()
 
 class Matrix: # Now it's real, immutable!
-    def __init__(self, v): self.v = v
-    def __repr__(self): return f"Mat{self.v}"
+    __slots__ = ("v",)
+    # One contiguous (C-order) buffer - the kernel and @ read it without strided access or a copy
+    def __init__(self, v):
+        v = np.ascontiguousarray(v)
+        # Small integer matrices (e.g. 0/1) are kept as int8 - 1 byte per value, exact
+        if v.dtype.kind in "iu" and v.size and v.min() >= -128 and v.max() <= 127:
+            v = v.astype(np.int8)
+        self.v = v
+    def __repr__(self): return f"Mat{self.v.tolist()}"
     
     def __mul__(self, other): 
-        # True 2x2 matrix multiplication
-        # c[i][j] = sum(a[i][k] * b[k][j])
-        result = [[0, 0], [0, 0]]
-        for i in range(2):
-            for j in range(2):
-                for k in range(2):
-                    result[i][j] += self.v[i][k] * other.v[k][j]
-        return Matrix(result)
+        # True matrix multiplication: c[i][j] = sum(a[i][k] * b[k][j])
+        a, b = self.v, other.v
+        if np.int8 in (a.dtype, b.dtype):
+            # Accumulate in (at least) int64 - int8 storage is only for the values themselves,
+            # products computed in int8/int16 would wrap. The result is narrowed again if it fits.
+            dtype = np.result_type(a, b, np.int64)
+            a, b = a.astype(dtype), b.astype(dtype)
+        if (_matmul is not None and a.dtype == b.dtype and _kernel_dtype(a.dtype)
+                and a.ndim == b.ndim == 2 and a.shape[1] == b.shape[0]):
+            return Matrix(_matmul(a, b))
+        return Matrix(a @ b)
         
-    def __eq__(self, other): return self.v == other.v
+    def __eq__(self, other):
+        if not isinstance(other, Matrix): return NotImplemented
+        a, b = self.v, other.v
+        if a.dtype == b.dtype and a.dtype.kind in "iu" and a.shape == b.shape:
+            return _probe_eq(a, b)
+        return np.array_equal(a, b)
+    # Consistent with __eq__ across dtypes (hash(1) == hash(1.0))
+    def __hash__(self): return hash((self.v.shape, tuple(self.v.ravel().tolist())))
+
+# Argument types whose hash follows their value - only these are used in verdict cache keys
+_HASHED_BY_VALUE = frozenset((Number, Matrix, int, float, complex, str, bool))
+
+def _widen(v):
+    # Integer products are exact in Matrix.__mul__ - int8 (or int32) stacks could overflow
+    return v.astype(np.result_type(v, np.int64)) if v.dtype.kind in "iu" else v
+
+def _matrix_commutes(x: Matrix, y: Matrix) -> bool:
+    """a * b == b * a with one stacked matmul: [a, b] @ [b, a] = [ab, ba]"""
+    a, b = x.v, y.v
+    if a.ndim != 2 or a.shape != b.shape or a.shape[0] != a.shape[1]:
+        return x * y == y * x
+    p = np.matmul(_widen(np.stack((a, b))), _widen(np.stack((b, a))))
+    return np.array_equal(p[0], p[1])
+
+# ==========================================
+# 5. SHARED INSTANCES
+# ==========================================
+# One system, parser and validator per process, created on first use - code importing this
+# file shares them instead of building its own (the regexes and the matrix kernel are
+# already prepared when the file is loaded).
+
+_SYSTEM: Optional[PhiSystem] = None
+_PARSER: Optional[PhiParser] = None
+_VALIDATOR: Optional[Validator] = None
+
+def get_system() -> PhiSystem:
+    global _SYSTEM
+    if _SYSTEM is None: _SYSTEM = PhiSystem()
+    return _SYSTEM
+
+def get_parser() -> PhiParser:
+    """Parser building into the shared system"""
+    global _PARSER
+    if _PARSER is None: _PARSER = PhiParser(get_system())
+    return _PARSER
+
+def get_validator() -> Validator:
+    global _VALIDATOR
+    if _VALIDATOR is None: _VALIDATOR = Validator()
+    return _VALIDATOR
 
 # ==========================================
-# 5. COMMISSIONING (ARCHITECT)
+# 6. COMMISSIONING (ARCHITECT)
 # ==========================================
 
 if __name__ == "__main__":
@@ -208,13 +823,38 @@ if __name__ == "__main__":
     }
     """
 
+    # 0. Parser regression checks (silent): a trailing "//" comment is dropped, even if it
+    #    contains keywords, while "//" inside a predicate is floor division; an axiom that
+    #    does not parse is reported and does not take the following rules with it
+    _check = PhiParser(PhiSystem()).parse_ast("""
+    module Check {
+        axiom positive : soft ( a > 0 ) // debts are fine in this module
+        axiom even : hard ( a // 2 * 2 == a )
+        axiom nz : hard ( b != 0 ) // data Number
+        axiom bad : HARD ( a in {1, 2} )
+        axiom small : hard ( a < 100 )
+    }
+    module Łódź {
+        axiom pos : hard ( a > 0 )
+    }
+    """)
+    assert _check == [{"name": "Check", "items": [("axiom", "positive", "soft", "a > 0"),
+                                                  ("axiom", "even", "hard", "a // 2 * 2 == a"),
+                                                  ("axiom", "nz", "hard", "b != 0"),
+                                                  ("invalid", "axiom bad"),
+                                                  ("axiom", "small", "hard", "a < 100")]},
+                      {"name": "Łódź", "items": [("axiom", "pos", "hard", "a > 0")]}], _check
+
     # 1. Initialization
-    sys = PhiSystem()
-    parser = PhiParser(sys)
+    sys = get_system()
+    logging.basicConfig(format="%(message)s", stream=stdout)
+    sys.set_verbosity(logging.DEBUG) # Full audit, including fulfilled rules
+    parser = get_parser()
     
-    # 2. Parsing (Building a C Structure)
-    parser.parse(source_code)
-    validator = Validator()
+    # 2. Parsing (Building a C Structure) - the AST of this source is cached next to the bytecode
+    parser.parse(source_code, cache_dir=os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__"))
+    sys.freeze()
+    validator = get_validator()
 
     # --- TEST 1: ARITHMETIC (Should pass, HARD rule met) ---
     print("\n>>> TEST 1: Arithmetic Environment")